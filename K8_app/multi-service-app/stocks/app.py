@@ -1,11 +1,16 @@
+import time
+STARTED_AT = time.perf_counter()
+
 import os
-import pymongo
-from pymongo.errors import DuplicateKeyError 
+from pymongo.errors import DuplicateKeyError
 from flask import Flask, jsonify, request
-import uuid
 from datetime import datetime
-import re
-import requests
+
+from portfolio_common.money import from_cents
+from portfolio_common.quotes import get_ticker_price, get_ticker_prices
+from portfolio_common.repository import InventoryRepository
+from portfolio_common.validation import validate_batch_ids, validate_new_stock, validate_update
+from portfolio_common.valuation import batch_values, portfolio_value, stock_value
 
 app = Flask(__name__)
 
@@ -14,17 +19,10 @@ db_name = os.environ.get("MONGO_DB_NAME")
 if not db_name:
     raise ValueError("Environment variable MONGO_DB_NAME is not set or empty")
 
-# Initialize MongoDB client and database
-client = pymongo.MongoClient("mongodb://mongo:27017/")
-db = client[db_name]
-inv = db["inventory"]
-
-# create a unique index on 'symbol'
-inv.create_index([("symbol", 1)], unique=True)
-
-
-def genID():
-    return str(uuid.uuid4())
+# The MongoDB collection (and its indexes) are initialized lazily; start connecting in the background
+repo = InventoryRepository(db_name, id_field='id', started_at=STARTED_AT)
+repo.warm_up()
+print(f"imported in {time.perf_counter() - STARTED_AT:.3f}s")
 
 
 @app.route('/kill', methods=['GET'])
@@ -32,6 +30,16 @@ def kill_container():
     os._exit(1)
 
 
+@app.route('/ready', methods=['GET'])
+def readiness():
+    """
+    Readiness gate: 200 once MongoDB is reachable and the indexes exist, 503 until then.
+    """
+    if not repo.is_ready():
+        return jsonify({"error": "not ready: MongoDB is not reachable"}), 503
+    return jsonify({"status": "ready"}), 200
+
+
 @app.route('/stocks', methods=['POST'])
 def addStock():
     try:
@@ -39,62 +47,22 @@ def addStock():
         if content_type != 'application/json':
             return jsonify({"error": "Expected application/json media type"}), 415
 
-        data = request.get_json()
-        required_fields = ['symbol', 'purchase price', 'shares']
-
-        # Check if required fields exist
-        if not all(field in data for field in required_fields):
-            return jsonify({"error": "Malformed data"}), 400
-
-        # Check if symbol is a string
-        if not isinstance(data['symbol'], str):
-            return jsonify({"error": "Invalid stock symbol"}), 400
-
-        # Check if shares is a positive integer
-        if not isinstance(data['shares'], int) or data['shares'] <= 0:
-            return jsonify({"error": "Shares must be a positive integer"}), 400
-
-        # Check if purchase price is a positive number
-        if not isinstance(data['purchase price'], (int, float)) or data['purchase price'] <= 0:
-            return jsonify({"error": "Purchase price must be a positive number"}), 400
-
-        # Generate a new UUID for "id"
-        new_id = genID()
-
-        # Check if name field is in the POST
-        if 'name' not in data:
-            name = "NA"
-        else:
-            if not isinstance(data['name'], str):
-                return jsonify({"error": "name must be a string"}), 400
-            name = data['name']
-
-        # Validate purchase date if provided
-        purchase_date = data.get('purchase date', "NA")
-        if purchase_date != "NA" and not validate_date_format(purchase_date):
-            return jsonify({"error": "Invalid date format. Use DD-MM-YYYY"}), 400
-
-        # Build the stock document
-        stock = {
-            "id": new_id,
-            "name": name,
-            "symbol": data['symbol'].upper(),
-            "purchase price": round(data['purchase price'], 2),
-            "purchase date": purchase_date,
-            "shares": data['shares']
-        }
+        # Validate the body and build the stock document
+        fields, error = validate_new_stock(request.get_json())
+        if error:
+            return jsonify({"error": error}), 400
 
         # Try inserting - if there's a duplicate symbol, catch DuplicateKeyError
         try:
-            inv.insert_one(stock)
+            new_id = repo.insert(fields)
         except DuplicateKeyError:
             return jsonify({"error": "Stock symbol already exists"}), 400
 
-        response_data = {"id": new_id}
+        response_data = {repo.id_field: new_id}
         return jsonify(response_data), 201
 
     except Exception as e:
-        return jsonify({"server error": str(e)}), 400
+        return jsonify({"server error": str(e)}), 500
 
 
 @app.route('/stocks', methods=['GET'])
@@ -108,16 +76,16 @@ def getStocks():
 
         if not query_params:
             # No filters; return everything
-            all_stocks = list(inv.find({}, {"_id": 0}))  # exclude Mongo's internal _id
-            return jsonify(all_stocks), 200
+            return jsonify(repo.find()), 200
 
-        allowed_fields = ['id', 'name', 'symbol', 'shares', 'purchase price', 'purchase date']
         for field in query_params.keys():
-            if field not in allowed_fields:
+            if field not in repo.query_fields():
                 return jsonify({'error': 'invalid query field'}), 422
 
-        stocks_cursor = inv.find(query_params, {"_id": 0})
-        filtered_stocks = list(stocks_cursor)
+        try:
+            filtered_stocks = repo.find(query_params)
+        except (ArithmeticError, ValueError):
+            return jsonify({'error': 'invalid purchase price'}), 422
 
         if not filtered_stocks:
             return jsonify({"error": "No stocks match the given filters"}), 404
@@ -131,7 +99,7 @@ def getStocks():
 @app.route('/stocks/<string:stockId>', methods=['GET'])
 def getStock(stockId):
     try:
-        stock = inv.find_one({"id": stockId}, {"_id": 0})
+        stock = repo.get(stockId)
         if stock is None:
             return jsonify({"error": "No such ID"}), 404
         return jsonify(stock), 200
@@ -143,13 +111,9 @@ def getStock(stockId):
 @app.route('/stocks/<string:stockId>', methods=['DELETE'])
 def deleteStock(stockId):
     try:
-        stock = inv.find_one({"id": stockId})
-        if not stock:
+        if not repo.delete(stockId):
             return jsonify({"error": "No such ID"}), 404
-
-        resp = inv.delete_one({"id": stockId})
-        if resp.deleted_count == 1:
-            return '', 204
+        return '', 204
 
     except Exception as e:
         return jsonify({"server error": str(e)}), 500
@@ -160,96 +124,42 @@ def updateStock(stockId):
     try:
         content_type = request.headers.get('Content-Type')
         if content_type != 'application/json':
-            return jsonify({"error": "expected application/json media type"}), 415
-
-        data = request.get_json()
-
-        required_fields = ['id', 'name', 'symbol', 'purchase price', 'purchase date', 'shares']
-        if not all(field in data for field in required_fields):
-            return jsonify({"error": "Malformed data"}), 400
+            return jsonify({"error": "Expected application/json media type"}), 415
 
-        stock = inv.find_one({'id': stockId})
+        stock = repo.get(stockId)
         if not stock:
             return jsonify({"error": "Not found"}), 404
 
-        # Check if the client is trying to change "id"
-        if data['id'] != stockId:
-            return jsonify({"error": "Stock ID cannot be changed"}), 400
-
-        # Check if the client is trying to change the symbol
-        if not isinstance(data['symbol'], str):
-            return jsonify({"error": "Invalid stock symbol"}), 400
-        if data['symbol'].upper() != stock['symbol']:
-            return jsonify({"error": "Stock symbol cannot be changed"}), 400
-
-        # Validate shares
-        if not isinstance(data['shares'], int) or data['shares'] <= 0:
-            return jsonify({"error": "Shares must be a positive integer"}), 400
-
-        # Validate purchase price
-        if not isinstance(data['purchase price'], (int, float)) or data['purchase price'] <= 0:
-            return jsonify({"error": "Purchase price must be a positive number"}), 400
-
-        # Validate name
-        if not isinstance(data['name'], str):
-            return jsonify({"error": "name must be a string"}), 400
-
-        # Validate date (only if it's not "NA")
-        if data['purchase date'] != "NA":
-            if not validate_date_format(data['purchase date']):
-                return jsonify({"error": "Invalid date format. Use DD-MM-YYYY"}), 400
-            purchase_date = data['purchase date']
-        else:
-            purchase_date = stock['purchase date']
-
-        updated_fields = {
-            'name': data['name'],
-            'purchase price': round(data['purchase price'], 2),
-            'purchase date': purchase_date,
-            'shares': data['shares']
-        }
-
-        inv.update_one({'id': stockId}, {'$set': updated_fields})
-        return jsonify({"id": stockId}), 200
-
-    except Exception as e:
-        return jsonify({"server error": str(e)}), 400
+        # Validate against the stored stock: id and symbol can't change
+        updated_fields, error = validate_update(request.get_json(), stock, repo.id_field)
+        if error:
+            return jsonify({"error": error}), 400
 
+        if not repo.update(stockId, updated_fields):
+            return jsonify({"error": "Not found"}), 404
+        return jsonify({repo.id_field: stockId}), 200
 
-def validate_date_format(date_string):
-    pattern = r"^\d{2}-\d{2}-\d{4}$"
-    if not re.match(pattern, date_string):
-        return False
-    try:
-        datetime.strptime(date_string, "%d-%m-%Y")
-        return True
-    except ValueError:
-        return False
+    except Exception as e:
+        return jsonify({"server error": str(e)}), 500
 
 
-def get_ticker_price(symbol):
+@app.route('/inventory-version', methods=['GET'])
+def get_inventory_version():
     """
-    Use external API to retrieve the current ticker price.
+    Return a counter that changes on every write to the inventory,
+    so clients can tell when their cached results are stale.
     """
     try:
-        api_url = f"https://api.api-ninjas.com/v1/stockprice?ticker={symbol}"
-        headers = {'X-Api-Key': 'ADD YOUR API KEY HERE'} # CHANGE TO YOUR NINJA API KEY
-        response = requests.get(api_url, headers=headers)
-        if response.status_code == requests.codes.ok:
-            data = response.json()
-            return data.get('price')
-        else:
-            print(f"Error: {response.status_code}, {response.text}")
-            return None
+        return jsonify({"version": repo.version()}), 200
+
     except Exception as e:
-        print(f"Unexpected error: {e}")
-        return None
+        return jsonify({"server error": str(e)}), 500
 
 
 @app.route('/stock-value/<string:stockId>', methods=['GET'])
 def get_stock_value(stockId):
     try:
-        stock = inv.find_one({'id': stockId})
+        stock = repo.get(stockId)
         if not stock:
             return jsonify({"error": "Not found"}), 404
 
@@ -257,12 +167,33 @@ def get_stock_value(stockId):
         if ticker_price is None:
             return jsonify({"error": "Failed to retrieve ticker price"}), 500
 
-        stock_value = ticker_price * stock['shares']
-        return jsonify({
-            "symbol": stock['symbol'],
-            "ticker": ticker_price,
-            "stock value": stock_value
-        }), 200
+        return jsonify(stock_value(stock, ticker_price)), 200
+
+    except Exception as e:
+        return jsonify({"server error": str(e)}), 500
+
+
+@app.route('/stock-value/batch', methods=['POST'])
+def get_stock_values():
+    """
+    Value many stocks in one call: one $in lookup and one quote per distinct symbol.
+    Expects {"ids": [...]} (at most MAX_BATCH_IDS) and returns a mapping of id -> value (or error).
+    """
+    try:
+        content_type = request.headers.get('Content-Type')
+        if content_type != 'application/json':
+            return jsonify({"error": "Expected application/json media type"}), 415
+
+        ids, error = validate_batch_ids(request.get_json())
+        if error:
+            return jsonify({"error": error}), 400
+
+        stocks = repo.find_by_ids(ids)
+
+        # fetch each distinct symbol only once
+        prices = get_ticker_prices(stock['symbol'] for stock in stocks.values())
+
+        return jsonify(batch_values(ids, stocks, prices)), 200
 
     except Exception as e:
         return jsonify({"server error": str(e)}), 500
@@ -271,19 +202,16 @@ def get_stock_value(stockId):
 @app.route('/portfolio-value', methods=['GET'])
 def get_portfolio_value():
     try:
-        portfolio_value = 0.0
-        stocks = inv.find()
-        for stock in stocks:
-            ticker_price = get_ticker_price(stock['symbol'])
-            if ticker_price is None:
-                return jsonify({"error": f"Failed to retrieve ticker price for {stock['symbol']}"}), 500
-            portfolio_value += ticker_price * stock['shares']
+        # Sum the stock values as exact integer cents, quoting each distinct symbol once
+        value_cents, error = portfolio_value(repo.holdings())
+        if error:
+            return jsonify({"error": error}), 500
 
         current_date = datetime.now().strftime('%Y-%m-%d')
 
         return jsonify({
             "date": current_date,
-            "portfolio value": portfolio_value
+            "portfolio value": from_cents(value_cents)
         }), 200
 
     except Exception as e:
@@ -1,10 +1,16 @@
+import time
+STARTED_AT = time.perf_counter()
+
 import os
-import pymongo
+from pymongo.errors import DuplicateKeyError
 from flask import Flask, jsonify, request
-import uuid
 from datetime import datetime
-import re
-import requests
+
+from portfolio_common.money import from_cents
+from portfolio_common.quotes import get_ticker_price, get_ticker_prices
+from portfolio_common.repository import InventoryRepository
+from portfolio_common.validation import validate_batch_ids, validate_new_stock, validate_update
+from portfolio_common.valuation import batch_values, portfolio_value, stock_value
 
 app = Flask(__name__)
 
@@ -15,74 +21,42 @@ db_name = os.environ.get("MONGO_DB_NAME")
 if not db_name:
     raise ValueError("Environment variable MONGO_DB_NAME is not set or empty")
 
-# Initialize the MongoDB client and database
-client = pymongo.MongoClient("mongodb://mongo:27017/")
-db = client[db_name]  # db_name must be a string
-inv = db["inventory"]
+# the MongoDB collection is connected lazily, start connecting in the background
+repo = InventoryRepository(db_name, id_field='_id', started_at=STARTED_AT)
+repo.warm_up()
+print(f"imported in {time.perf_counter() - STARTED_AT:.3f}s")
 
-Stocks = {}
-def genID():
-    return str(uuid.uuid4())
 
 @app.route('/kill', methods=['GET'])
 def kill_container():
     os._exit(1)
 
+#readiness gate: 200 once MongoDB is reachable, 503 until then
+@app.route('/ready', methods=['GET'])
+def readiness():
+    if not repo.is_ready():
+        return jsonify({"error": "not ready: MongoDB is not reachable"}), 503
+    return jsonify({"status": "ready"}), 200
+
 @app.route('/stocks', methods=['POST'])
 def addStock():
     try:
         content_type = request.headers.get('Content-Type')
         if content_type != 'application/json':
             return jsonify({"error": "Expected application/json media type"}), 415
-        data = request.get_json()
-        required_fields = ['symbol', 'purchase price', 'shares']
-
-        #check if there is Malformed data
-        if not all(field in data for field in required_fields):
-            return jsonify({"error": "Malformed data"}), 400
-        
-        #check if symbol is not a string
-        if not isinstance(data['symbol'], str):
-                return jsonify({"error": "Invalid stock symbol"}), 400
-        
-        # check if shares is not a positive integer
-        if not isinstance(data['shares'], int) or data['shares'] <= 0:
-            return jsonify({"error": "Shares must be a positive integer"}), 400
-
-        # check if purchase price is not a positive number
-        if not isinstance(data['purchase price'], (int, float)) or data['purchase price'] <= 0:
-            return jsonify({"error": "Purchase price must be a positive number"}), 400
-        # generate UUID
-        new_id = genID()
-
-        # check if name field enter in the POST
-        if 'name' not in data:
-            name = "NA"
-        else:
-            if not isinstance(data['name'], str):
-                return jsonify({"error": "name must be a string"}), 400
-            name = data['name']
-
-        # check if purchase date field enter in the POST
-        doc = inv.find_one({"symbol": data['symbol'].upper()})
-        if doc:
-            return jsonify({"error": "Stock symbol already exists for this account"}), 400
-
-        # Set optional fields
-        name = data.get('name', "NA")
-        purchase_date = data.get('purchase date', "NA")
-        if purchase_date != "NA" and not validate_date_format(purchase_date):
-            return jsonify({"error": "Invalid date format. Use DD-MM-YYYY"}), 400
-
-        stock = {'_id': new_id,
-                 'name': name,
-                 'symbol': data['symbol'].upper(),
-                 'purchase price': round(data['purchase price'], 2),
-                 'purchase date': purchase_date,
-                 'shares': data['shares']
-                }
-        inv.insert_one(stock)
-        response_data = {'_id': new_id}
+
+        #validate the body and build the stock to store
+        fields, error = validate_new_stock(request.get_json())
+        if error:
+            return jsonify({"error": error}), 400
+
+        # the unique index on symbol rejects duplicates
+        try:
+            new_id = repo.insert(fields)
+        except DuplicateKeyError:
+            return jsonify({"error": "Stock symbol already exists"}), 400
+
+        response_data = {repo.id_field: new_id}
         return jsonify(response_data), 201
     except Exception as e:
         return jsonify({"server error": str(e)}), 500
@@ -93,20 +67,19 @@ def getStocks():
     try:
         #moves the filters into dic
         query = request.args.to_dict()
-        
+
         #in case there is no filters, return all
         if not query:
-            all_stocks = list(inv.find())
-            return jsonify(all_stocks), 200
+            return jsonify(repo.find()), 200
         for field in query.keys():
-            if field not in ['_id','name','symbol','shares', 'purchase price', 'purchase date']:
+            if field not in repo.query_fields():
                 return jsonify({'error': 'invalid query field'}), 422
 
         # Fetch filtered results
-        stocks = inv.find(query)
-
-        # Convert cursor to list
-        filtered_stocks = list(stocks)
+        try:
+            filtered_stocks = repo.find(query)
+        except (ArithmeticError, ValueError):
+            return jsonify({'error': 'invalid purchase price'}), 422
 
         #in case there is no filtered items
         if not filtered_stocks:
@@ -122,11 +95,10 @@ def getStocks():
 def getStock(stockId):
     #try to return the object by id
     try:
-        stock = inv.find_one({'_id': stockId})
+        stock = repo.get(stockId)
+        if stock is None:
+            return jsonify({"error": "No such ID"}), 404
         return jsonify(stock), 200
-    # return Key error in case there is no id such the input
-    except KeyError:
-       return jsonify({"error": "No such ID"}), 404
     except Exception as e:
         return jsonify({"server error": str(e)}), 500
 
@@ -134,15 +106,9 @@ def getStock(stockId):
 @app.route('/stocks/<string:stockId>', methods=['DELETE'])
 def deleteStock(stockId):
     try:
-        # try to get the stock that want to delete using their id
-        stock = inv.find_one({'_id': stockId})
-        if not stock:
+        if not repo.delete(stockId):
             return jsonify({"error": "No such ID"}), 404
-        resp = inv.delete_one({'_id': stockId})
-        if resp.deleted_count == 1:  # deleted
-            return '', 204
-    except KeyError:
-        return jsonify({"error": "No such ID"}), 404
+        return '', 204
     except Exception as e:
         return jsonify({"server error": str(e)}), 500
 
@@ -152,117 +118,40 @@ def updateStock(stockId):
     try:
         content_type = request.headers.get('Content-Type')
         if content_type != 'application/json':
-            return jsonify({"error": "expected application/json media type"}), 415
-        data = request.get_json()
-
-        #Check if required fields are present (all fields must appear in the request)
-        required_fields = ['_id', 'name', 'symbol', 'purchase price', 'purchase date', 'shares']
-        if not all(field in data for field in required_fields):
-            return jsonify({"error": "Malformed data"}), 400
-
-        stock = inv.find_one({'_id': stockId})
-        # changing ID isn't possible
-        curr_id = stock['_id']
-        if data['_id'] != curr_id:
-            return jsonify({"error": "Stock ID can not be change"}),400
-        
-        # changing symbol isn't possible
-        symbol = stock['symbol']
-        if not isinstance(data['symbol'],str):
-            return jsonify({"error": "Invalid stock symbol"}), 400
-        if data['symbol'].upper() != symbol:
-            return jsonify({"error": "Stock symbol can not be change"})
-
-        # validating data format
-        if not isinstance(data['shares'], int) or (data['shares'] <= 0):
-            return jsonify({"error": "Shares must be a positive integer"}), 400
-
-        if not isinstance(data['purchase price'], (int, float)) or data['purchase price'] <= 0:
-            return jsonify({"error": "Purchase price must be a positive number"}), 400
-
-        # adding a name field
-        if stock['name'] == "NA" and data['name'] != "NA":
-            if not isinstance(data['name'], str):
-                return jsonify({"error": "name must be a string"}), 400
-        # name field is already exits but was not updated, the current name remains the same
-        if stock['name'] != "NA" and data['name'] == "NA":
-            name = stock['name']
-        else:
-            if not isinstance(data['name'], str):
-                return jsonify({"error": "name must be a string"}), 400
-            name = data['name']
-
-        # adding a date field
-        if stock['purchase date'] == "NA" and data['purchase date'] != "NA":
-            if not validate_date_format(data['purchase date']):
-                return jsonify({"error": "Invalid date format. Use DD-MM-YYYY"}), 400
-            purchase_date = data['purchase date']
-        # date field is already exits but was not updated, the current date remains the same
-        elif stock['purchase date'] != "NA" and data['purchase date'] == "NA":
-            purchase_date = stock['purchase date']
-        # adding date field
-        elif stock['purchase date'] != "NA" and data['purchase date'] != "NA":
-            if not validate_date_format(data['purchase date']):
-                return jsonify({"error": "Invalid date format. Use DD-MM-YYYY"}), 400
-            purchase_date = data['purchase date']
-        else:
-            purchase_date = stock['purchase date']
-
-        found = inv.find_one({'_id': stockId})
+            return jsonify({"error": "Expected application/json media type"}), 415
+
         # ID isn't valid
-        if not found:
+        stock = repo.get(stockId)
+        if not stock:
             return jsonify({"error": "Not found"}), 404
 
-        updated_fields = {'name': name,
-                 'purchase price': round(data['purchase price'], 2),
-                 'purchase date': purchase_date,
-                 'shares': data['shares']
-                 }
+        #validate the body against the stored stock (id and symbol can't change)
+        updated_fields, error = validate_update(request.get_json(), stock, repo.id_field)
+        if error:
+            return jsonify({"error": error}), 400
 
-        inv.update_one({'_id': stockId}, {'$set': updated_fields})
-        response_data = {'_id': stockId}
+        if not repo.update(stockId, updated_fields):
+            return jsonify({"error": "Not found"}), 404
+        response_data = {repo.id_field: stockId}
         return jsonify(response_data), 200
 
     except Exception as e:
         return jsonify({"server error": str(e)}), 500
 
 
-def validate_date_format(date_string):
-    #build a valid pattern to date input
-    pattern = r"^\d{2}-\d{2}-\d{4}$"
-    if not re.match(pattern, date_string):
-        return False
+#the inventory version changes on every write, so clients can tell when their cached results are stale
+@app.route('/inventory-version', methods=['GET'])
+def get_inventory_version():
     try:
-        #attempt to parse the date with the expected format
-        datetime.strptime(date_string, "%d-%m-%Y")
-        return True
-    except ValueError:
-        #raised when the format does not match
-        return False
-
-
-def get_ticker_price(symbol):
-    try:
-        api_url = f"https://api.api-ninjas.com/v1/stockprice?ticker={symbol}"
-        headers = {'X-Api-Key': 'ADD YOUR API KEY HERE'} # CHANGE TO YOUR NINJA API KEY
-        response = requests.get(api_url, headers=headers)
-
-        #make an api call using symbol
-        if response.status_code == requests.codes.ok:
-            data = response.json()
-            return data.get('price')
-        else:
-            print(f"Error: {response.status_code}, {response.text}")
-            return None
+        return jsonify({"version": repo.version()}), 200
     except Exception as e:
-        print(f"Unexpected error: {e}")
-        return None
+        return jsonify({"server error": str(e)}), 500
 
 
 @app.route('/stock-value/<string:stockId>', methods=['GET'])
 def get_stock_value(stockId):
     try:
-        stock = inv.find_one({'_id': stockId})
+        stock = repo.get(stockId)
         if not stock:
             return jsonify({"error": "Not found"}), 404
 
@@ -271,32 +160,43 @@ def get_stock_value(stockId):
         if ticker_price is None:
             return jsonify({"error": "Failed to retrieve ticker price"}), 500
 
-        #calculate the stock value
-        stock_value = ticker_price * stock['shares']
-        return jsonify({
-            "symbol": stock['symbol'],
-            "ticker": ticker_price,
-            "stock value": stock_value
-        }), 200
+        return jsonify(stock_value(stock, ticker_price)), 200
 
     except Exception as e:
         return jsonify({"server error": str(e)}), 500
 
 
-@app.route('/portfolio-value', methods=['GET'])
-def get_portfolio_value():
+#value many stocks in one call: one $in lookup and one quote per distinct symbol.
+#expects {"ids": [...]} and returns a mapping of id -> value (or error)
+@app.route('/stock-value/batch', methods=['POST'])
+def get_stock_values():
     try:
-        portfolio_value = 0.0
+        content_type = request.headers.get('Content-Type')
+        if content_type != 'application/json':
+            return jsonify({"error": "Expected application/json media type"}), 415
+
+        ids, error = validate_batch_ids(request.get_json())
+        if error:
+            return jsonify({"error": error}), 400
+
+        stocks = repo.find_by_ids(ids)
 
-        # iterate over all stocks in the portfolio
-        stocks = inv.find()
-        for stock in stocks: # fetch the current ticker price for the stock
-            ticker_price = get_ticker_price(stock['symbol'])
-            if ticker_price is None:
-                return jsonify({"error": "Failed to retrieve ticker price"}), 500
+        # fetch each distinct symbol only once
+        prices = get_ticker_prices(stock['symbol'] for stock in stocks.values())
 
-        # calculate the stock value and add it to the portfolio value
-            portfolio_value += ticker_price * stock['shares']
+        return jsonify(batch_values(ids, stocks, prices)), 200
+
+    except Exception as e:
+        return jsonify({"server error": str(e)}), 500
+
+
+@app.route('/portfolio-value', methods=['GET'])
+def get_portfolio_value():
+    try:
+        # sum the stock values as exact integer cents, quoting each distinct symbol once
+        value_cents, error = portfolio_value(repo.holdings())
+        if error:
+            return jsonify({"error": error}), 500
 
         # get the current date
         current_date = datetime.now().strftime('%Y-%m-%d')
@@ -304,7 +204,7 @@ def get_portfolio_value():
         # return the portfolio value and date
         return jsonify({
             "date": current_date,
-            "portfolio value": portfolio_value
+            "portfolio value": from_cents(value_cents)
         }), 200
 
     except Exception as e:
@@ -0,0 +1,5 @@
+"""
+Code shared by the compose (multi_services_app) and K8s (K8_app) deployments:
+the inventory repository, the quote client, the valuation engine and the
+caches, so both stacks get the same behavior and optimizations.
+"""
@@ -0,0 +1,52 @@
+from portfolio_common.cache import LRUCache
+from portfolio_common.inventory_client import fetch_inventory_version, fetch_stocks
+from portfolio_common.money import from_cents
+from portfolio_common.quotes import PriceSnapshot
+from portfolio_common.valuation import capital_gains_cents, filter_by_shares
+
+
+class CapitalGains:
+    """
+    Total capital gain over the stocks services at a list of base URLs.
+
+    Results are cached by (services, filters, inventory versions, price snapshot id),
+    so a cached result is served only while neither the holdings nor the prices have changed.
+    """
+
+    def __init__(self, cache_size, snapshot_seconds):
+        self.results = LRUCache(cache_size)
+        self.prices = PriceSnapshot(snapshot_seconds)
+
+    def total(self, urls, numsharesgt=None, numshareslt=None):
+        """
+        Returns ({"total_capital_gain": ...}, None) or (None, error message for a 500).
+        """
+        versions = tuple(fetch_inventory_version(url) for url in urls)
+        snapshot_id = self.prices.current_id()
+        cache_key = (tuple(urls), numsharesgt, numshareslt, versions, snapshot_id)
+        # no price snapshot means prices may change on every request
+        cacheable = None not in versions and snapshot_id is not None
+        if cacheable:
+            cached = self.results.get(cache_key)
+            if cached is not None:
+                return cached, None
+
+        stocks = []
+        for url in urls:
+            fetched = fetch_stocks(url)
+            if fetched is None:
+                return None, "Failed to retrieve stocks"
+            stocks.extend(fetched)
+        stocks = filter_by_shares(stocks, numsharesgt, numshareslt)
+
+        # fetch the price of each distinct symbol once per snapshot
+        ticker_prices = {symbol: self.prices.get_units(symbol, snapshot_id)
+                         for symbol in {stock["symbol"] for stock in stocks}}
+        for symbol, price in ticker_prices.items():
+            if price is None:
+                return None, f"Failed to retrieve ticker price for {symbol}"
+
+        result = {"total_capital_gain": from_cents(capital_gains_cents(stocks, ticker_prices))}
+        if cacheable:
+            self.results.put(cache_key, result)
+        return result, None
@@ -0,0 +1,29 @@
+def fetch_inventory_version(url):
+    """
+    Ask a stocks service for its inventory version.
+    Returns None when it can't be fetched, which callers treat as "don't cache".
+    """
+    import requests  # imported lazily so the services start serving sooner
+    try:
+        response = requests.get(f"{url}/inventory-version")
+        if response.status_code == 200:
+            return response.json()["version"]
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+    return None
+
+
+def fetch_stocks(url):
+    """
+    Fetch every stock of a stocks service, as GET /stocks presents them.
+    Returns None when they can't be fetched.
+    """
+    import requests  # imported lazily so the services start serving sooner
+    try:
+        response = requests.get(f"{url}/stocks")
+        if response.status_code == 200:
+            return response.json()
+        print(f"Error: {response.status_code}, {response.text}")
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+    return None
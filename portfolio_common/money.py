@@ -0,0 +1,58 @@
+import math
+from decimal import Decimal, ROUND_HALF_UP
+
+# Ticker prices are held as integer millionths of a dollar, so share counts
+# multiply them exactly; amounts are rounded to cents once, at the end.
+PRICE_SCALE = 10 ** 6
+UNITS_PER_CENT = PRICE_SCALE // 100
+
+
+def to_decimal(amount):
+    """
+    The exact decimal value of a dollar amount (floats via their shortest repr).
+    Raises ValueError for NaN or infinity and ArithmeticError for non-numbers.
+    """
+    value = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+    if not value.is_finite():
+        raise ValueError(f"amount must be finite, got {amount!r}")
+    return value
+
+
+def to_cents(amount):
+    """
+    Convert a dollar amount to integer cents, rounding half up.
+    """
+    return int((to_decimal(amount) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def to_price_units(amount):
+    """
+    Convert a ticker price to integer millionths of a dollar (exact for up to 6 decimals).
+    """
+    return int((to_decimal(amount) * PRICE_SCALE).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def units_to_cents(units):
+    """
+    Round an amount in price units to integer cents, half up (away from zero).
+    """
+    cents, remainder = divmod(abs(units), UNITS_PER_CENT)
+    if 2 * remainder >= UNITS_PER_CENT:
+        cents += 1
+    return -cents if units < 0 else cents
+
+
+def from_cents(cents):
+    """
+    Convert integer cents back to a dollar amount for responses.
+    """
+    return cents / 100
+
+
+def is_positive_amount(value):
+    """
+    True for a finite number > 0. Rejects bools, which are ints to isinstance.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    return math.isfinite(value) and value > 0
@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+
+from portfolio_common.money import to_price_units
+
+NINJA_API_KEY = os.environ.get("NINJA_API_KEY", 'ADD YOUR API KEY HERE')  # CHANGE TO YOUR NINJA API KEY
+
+
+def get_ticker_price(symbol):
+    """
+    Use external API to retrieve the current ticker price, or None on failure.
+    """
+    try:
+        import requests  # imported lazily so the services start serving sooner
+        api_url = f"https://api.api-ninjas.com/v1/stockprice?ticker={symbol}"
+        headers = {'X-Api-Key': NINJA_API_KEY}
+        response = requests.get(api_url, headers=headers)
+        if response.status_code == requests.codes.ok:
+            data = response.json()
+            return data.get('price')
+        else:
+            print(f"Error: {response.status_code}, {response.text}")
+            return None
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+        return None
+
+
+def get_ticker_prices(symbols):
+    """
+    Fetch each distinct symbol once. Maps symbol -> price (None on failure).
+    """
+    return {symbol: get_ticker_price(symbol) for symbol in set(symbols)}
+
+
+class PriceSnapshot:
+    """
+    Ticker prices in price units (millionths of a dollar), shared by all requests within the same time window.
+    A new snapshot (with a new id) starts every `seconds` seconds; 0 disables the snapshot,
+    so every request quotes afresh (and its snapshot id is None).
+    """
+
+    def __init__(self, seconds):
+        if seconds < 0:
+            raise ValueError(f"snapshot seconds must be >= 0, got {seconds}")
+        self.seconds = seconds
+        self._id = None
+        self._prices = {}
+        self._lock = threading.Lock()
+
+    def current_id(self):
+        if not self.seconds:
+            return None
+        return int(time.time() // self.seconds)
+
+    def get_units(self, symbol, snapshot_id):
+        """
+        The symbol's price in price units, or None if the quote failed (failures aren't cached).
+        Snapshots only move forward: a request still on an older snapshot fetches without storing,
+        and the first price stored for a symbol is the one every request of that snapshot sees.
+        """
+        price = None
+        if snapshot_id is not None:
+            with self._lock:
+                if self._id is None or snapshot_id > self._id:
+                    self._id = snapshot_id
+                    self._prices = {}
+                if snapshot_id == self._id:
+                    price = self._prices.get(symbol)
+
+        if price is None:
+            ticker_price = get_ticker_price(symbol)
+            if ticker_price is None:
+                return None
+            price = to_price_units(ticker_price)
+            if snapshot_id is not None:
+                with self._lock:
+                    if self._id == snapshot_id:
+                        price = self._prices.setdefault(symbol, price)
+        return price
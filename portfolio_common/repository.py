@@ -0,0 +1,214 @@
+import os
+import threading
+import time
+import uuid
+
+import pymongo
+from pymongo.errors import PyMongoError
+
+from portfolio_common.money import from_cents, to_cents
+
+MONGO_URL = os.environ.get("MONGO_URL", "mongodb://mongo:27017/")
+MONGO_RETRIES = 3
+MONGO_RETRY_DELAY = 0.5  # seconds, doubled after every failed attempt
+
+
+class InventoryRepository:
+    """
+    The "inventory" collection of one portfolio database.
+
+    `id_field` is the document field holding the stock id, which differs
+    between deployments ('_id' for compose, 'id' for K8s). The collection
+    is connected lazily on first use, with retries, and always carries a
+    unique index on 'symbol' so duplicate symbols raise DuplicateKeyError.
+    """
+
+    def __init__(self, db_name, id_field, url=MONGO_URL, started_at=None):
+        self.db_name = db_name
+        self.id_field = id_field
+        self.url = url
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self._client = None
+        self._inv = None
+        self._bump_pending = False
+        self._lock = threading.Lock()
+
+    def collection(self, retries=MONGO_RETRIES):
+        """
+        Connect to MongoDB and build the indexes on first use.
+        Retries with backoff so an unreachable Mongo fails the request, not the import.
+        """
+        if self._inv is not None:
+            return self._inv
+        with self._lock:
+            if self._inv is not None:
+                return self._inv
+            # a single client for the whole process: construction doesn't connect,
+            # so only the index build below is retried
+            if self._client is None:
+                self._client = pymongo.MongoClient(self.url, serverSelectionTimeoutMS=2000)
+            delay = MONGO_RETRY_DELAY
+            for attempt in range(1, retries + 1):
+                try:
+                    inv = self._client[self.db_name]["inventory"]
+                    inv.create_index([("symbol", 1)], unique=True)
+                    self._inv = inv
+                    print(f"ready in {time.perf_counter() - self.started_at:.3f}s")
+                    return self._inv
+                except PyMongoError:
+                    if attempt == retries:
+                        raise
+                    time.sleep(delay)
+                    delay *= 2
+
+    def warm_up(self):
+        """
+        Connect in the background so the first request doesn't pay for it.
+        """
+        def connect():
+            try:
+                self.collection()
+            except PyMongoError as e:
+                # not fatal: the readiness probe and the next request try again
+                print(f"MongoDB not reachable yet: {e}")
+
+        threading.Thread(target=connect, daemon=True).start()
+
+    def is_ready(self):
+        """
+        Readiness check: True while MongoDB is reachable and the indexes exist.
+        Once connected, every check pings, so an outage turns readiness off again.
+        """
+        if self._inv is None and self._lock.locked():
+            return False  # still connecting
+        try:
+            if self._inv is None:
+                self.collection(retries=1)
+            else:
+                self._client.admin.command('ping')
+            return True
+        except PyMongoError:
+            return False
+
+    @property
+    def projection(self):
+        # hide Mongo's internal _id unless it is the stock id
+        return None if self.id_field == '_id' else {'_id': 0}
+
+    def query_fields(self):
+        """
+        The fields GET /stocks may filter on.
+        """
+        return [self.id_field, 'name', 'symbol', 'shares', 'purchase price', 'purchase date']
+
+    def find(self, query=None):
+        """
+        All stocks matching `query` (API field names), as the API presents them.
+        Raises ArithmeticError or ValueError for a non-numeric "purchase price" filter.
+        """
+        query = price_query(dict(query or {}))
+        return [serialize_stock(stock) for stock in self.collection().find(query, self.projection)]
+
+    def get(self, stock_id):
+        """
+        The stock with this id as the API presents it, or None.
+        """
+        stock = self.collection().find_one({self.id_field: stock_id}, self.projection)
+        return serialize_stock(stock) if stock is not None else None
+
+    def insert(self, fields):
+        """
+        Store a new stock and return its generated id.
+        Raises DuplicateKeyError if the symbol already exists.
+        """
+        new_id = str(uuid.uuid4())
+        self.collection().insert_one({self.id_field: new_id, **fields})
+        self.bump_version()
+        return new_id
+
+    def update(self, stock_id, fields):
+        """
+        Set `fields` on the stock; False if there is no such id.
+        """
+        # also drop the legacy float price field if the document still has one
+        resp = self.collection().update_one(
+            {self.id_field: stock_id}, {'$set': fields, '$unset': {'purchase price': ""}}
+        )
+        if resp.matched_count == 0:
+            return False
+        self.bump_version()
+        return True
+
+    def delete(self, stock_id):
+        """
+        Delete the stock; False if there is no such id.
+        """
+        resp = self.collection().delete_one({self.id_field: stock_id})
+        if resp.deleted_count == 0:
+            return False
+        self.bump_version()
+        return True
+
+    def find_by_ids(self, ids):
+        """
+        Resolve many ids with a single $in query. Maps id -> stored document.
+        """
+        inv = self.collection()
+        return {stock[self.id_field]: stock for stock in inv.find({self.id_field: {'$in': ids}})}
+
+    def holdings(self):
+        """
+        The symbol and shares of every stock, for valuation.
+        """
+        return list(self.collection().find({}, {'symbol': 1, 'shares': 1}))
+
+    def version(self):
+        """
+        A counter that changes on every write to the inventory.
+        After a failed bump the version is unavailable (PyMongoError) until the bump is retried
+        successfully here, so clients stop caching instead of serving results the version doesn't cover.
+        Another replica of the same database doesn't know about the failure: for its readers the
+        price snapshot window bounds how long a result can stay stale.
+        """
+        if self._bump_pending:
+            self._bump()
+        doc = self.collection().database['meta'].find_one({'_id': 'inventory'})
+        return doc['version'] if doc else 0
+
+    def bump_version(self):
+        """
+        Called after a successful write. A failure is logged rather than raised:
+        the write itself happened, so the caller should still report success.
+        """
+        try:
+            self._bump()
+        except PyMongoError as e:
+            self._bump_pending = True
+            print(f"Failed to bump the inventory version: {e}")
+
+    def _bump(self):
+        self.collection().database['meta'].update_one({'_id': 'inventory'}, {'$inc': {'version': 1}}, upsert=True)
+        self._bump_pending = False
+
+def serialize_stock(stock):
+    """
+    Present the stored cents as the "purchase price" the API exposes,
+    keeping the exact "purchase price cents" alongside for valuation.
+    """
+    stock = dict(stock)
+    if 'purchase price cents' in stock:
+        stock['purchase price'] = from_cents(stock['purchase price cents'])
+    else:
+        # legacy document, not migrated yet
+        stock['purchase price cents'] = to_cents(stock['purchase price'])
+    return stock
+
+
+def price_query(query):
+    """
+    Rewrite a "purchase price" filter in dollars to the stored cents field.
+    Raises ArithmeticError or ValueError if the price isn't a finite number.
+    """
+    if 'purchase price' in query:
+        query['purchase price cents'] = to_cents(query.pop('purchase price'))
+    return query
@@ -0,0 +1,108 @@
+import re
+from datetime import datetime
+
+from portfolio_common.money import is_positive_amount, to_cents
+
+# Upper bound on ids per /stock-value/batch request, which bounds the $in query and the quote fan-out
+MAX_BATCH_IDS = 100
+
+
+def validate_date_format(date_string):
+    """
+    True for a DD-MM-YYYY date that exists on the calendar.
+    """
+    pattern = r"^\d{2}-\d{2}-\d{4}$"
+    if not isinstance(date_string, str) or not re.match(pattern, date_string):
+        return False
+    try:
+        datetime.strptime(date_string, "%d-%m-%Y")
+        return True
+    except ValueError:
+        return False
+
+
+def is_positive_int(value):
+    # bools are ints to isinstance, but not share counts
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def validate_new_stock(data):
+    """
+    Check a POST /stocks body.
+    Returns (fields to store, None) or (None, error message for a 400).
+    """
+    required_fields = ['symbol', 'purchase price', 'shares']
+    if not isinstance(data, dict) or not all(field in data for field in required_fields):
+        return None, "Malformed data"
+    if not isinstance(data['symbol'], str):
+        return None, "Invalid stock symbol"
+    if not is_positive_int(data['shares']):
+        return None, "Shares must be a positive integer"
+    if not is_positive_amount(data['purchase price']):
+        return None, "Purchase price must be a positive number"
+
+    name = data.get('name', "NA")
+    if not isinstance(name, str):
+        return None, "name must be a string"
+    purchase_date = data.get('purchase date', "NA")
+    if purchase_date != "NA" and not validate_date_format(purchase_date):
+        return None, "Invalid date format. Use DD-MM-YYYY"
+
+    return {
+        'name': name,
+        'symbol': data['symbol'].upper(),
+        'purchase price cents': to_cents(data['purchase price']),
+        'purchase date': purchase_date,
+        'shares': data['shares']
+    }, None
+
+
+def validate_batch_ids(data):
+    """
+    Check a POST /stock-value/batch body: {"ids": [...]} with at most MAX_BATCH_IDS string ids.
+    Returns (ids, None) or (None, error message for a 400).
+    """
+    ids = data.get('ids') if isinstance(data, dict) else None
+    if not isinstance(ids, list) or not all(isinstance(stock_id, str) for stock_id in ids):
+        return None, "Malformed data"
+    if len(ids) > MAX_BATCH_IDS:
+        return None, f"At most {MAX_BATCH_IDS} ids per request"
+    return ids, None
+
+
+def validate_update(data, stock, id_field):
+    """
+    Check a PUT /stocks/<id> body against the stored `stock`.
+    The id and symbol can't change; "NA" for name or purchase date keeps the stored value.
+    Returns (fields to set, None) or (None, error message for a 400).
+    """
+    required_fields = [id_field, 'name', 'symbol', 'purchase price', 'purchase date', 'shares']
+    if not isinstance(data, dict) or not all(field in data for field in required_fields):
+        return None, "Malformed data"
+    if data[id_field] != stock[id_field]:
+        return None, "Stock ID cannot be changed"
+    if not isinstance(data['symbol'], str):
+        return None, "Invalid stock symbol"
+    if data['symbol'].upper() != stock['symbol']:
+        return None, "Stock symbol cannot be changed"
+    if not is_positive_int(data['shares']):
+        return None, "Shares must be a positive integer"
+    if not is_positive_amount(data['purchase price']):
+        return None, "Purchase price must be a positive number"
+    if not isinstance(data['name'], str):
+        return None, "name must be a string"
+
+    name = stock['name'] if data['name'] == "NA" else data['name']
+    if data['purchase date'] == "NA":
+        purchase_date = stock['purchase date']
+    elif validate_date_format(data['purchase date']):
+        purchase_date = data['purchase date']
+    else:
+        return None, "Invalid date format. Use DD-MM-YYYY"
+
+    return {
+        'name': name,
+        'purchase price cents': to_cents(data['purchase price']),
+        'purchase date': purchase_date,
+        'shares': data['shares']
+    }, None
@@ -0,0 +1,71 @@
+from portfolio_common.money import UNITS_PER_CENT, from_cents, to_price_units, units_to_cents
+from portfolio_common.quotes import get_ticker_prices
+
+
+def stock_value(stock, ticker_price):
+    """
+    The API representation of a stock's current value.
+    """
+    return {
+        "symbol": stock['symbol'],
+        "ticker": ticker_price,
+        "stock value": from_cents(units_to_cents(to_price_units(ticker_price) * stock['shares']))
+    }
+
+
+def batch_values(ids, stocks_by_id, prices):
+    """
+    Value each requested id, reporting missing ids and failed quotes per id.
+    `prices` maps symbol -> ticker price (None when the quote failed).
+    """
+    values = {}
+    for stock_id in ids:
+        stock = stocks_by_id.get(stock_id)
+        if stock is None:
+            values[stock_id] = {"error": "Not found"}
+        elif prices[stock['symbol']] is None:
+            values[stock_id] = {"error": "Failed to retrieve ticker price"}
+        else:
+            values[stock_id] = stock_value(stock, prices[stock['symbol']])
+    return values
+
+
+def portfolio_value_cents(stocks, prices):
+    """
+    Sum of shares * price in integer cents, rounded once at the end.
+    `prices` maps symbol -> price units (see money.to_price_units).
+    """
+    return units_to_cents(sum(prices[stock['symbol']] * stock['shares'] for stock in stocks))
+
+
+def portfolio_value(holdings):
+    """
+    Quote each distinct symbol once and sum the holdings' value.
+    Returns (value in integer cents, None) or (None, error message for a 500).
+    """
+    prices = get_ticker_prices(stock['symbol'] for stock in holdings)
+    for symbol, ticker_price in prices.items():
+        if ticker_price is None:
+            return None, f"Failed to retrieve ticker price for {symbol}"
+    price_units = {symbol: to_price_units(ticker_price) for symbol, ticker_price in prices.items()}
+    return portfolio_value_cents(holdings, price_units), None
+
+
+def capital_gains_cents(stocks, prices):
+    """
+    Sum of shares * (price - purchase price) in integer cents, rounded once at the end.
+    `stocks` are API representations carrying the stored "purchase price cents";
+    `prices` maps symbol -> price units.
+    """
+    return units_to_cents(sum(
+        (prices[stock['symbol']] - stock['purchase price cents'] * UNITS_PER_CENT) * stock['shares']
+        for stock in stocks
+    ))
+
+
+def filter_by_shares(stocks, numsharesgt=None, numshareslt=None):
+    if numsharesgt is not None:
+        stocks = [stock for stock in stocks if stock['shares'] > numsharesgt]
+    if numshareslt is not None:
+        stocks = [stock for stock in stocks if stock['shares'] < numshareslt]
+    return stocks
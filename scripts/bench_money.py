@@ -0,0 +1,63 @@
+"""
+Compare the old float capital-gains loop against the integer-cents path
+the capital-gains service runs: holdings as served by GET /stocks (with
+"purchase price cents") and integer price units from the PriceSnapshot.
+
+Usage:
+    python -m scripts.bench_money [number of holdings]
+"""
+import random
+import sys
+import timeit
+from decimal import Decimal
+
+from portfolio_common.money import to_cents, to_price_units
+from portfolio_common.repository import serialize_stock
+from portfolio_common.valuation import capital_gains_cents
+
+
+def make_portfolio(size):
+    rng = random.Random(42)
+    return [
+        {'symbol': f"S{i}", 'purchase price cents': to_cents(round(rng.uniform(1, 1000), 2)),
+         'shares': rng.randint(1, 10000)}
+        for i in range(size)
+    ]
+
+
+def float_gains(stocks, prices):
+    # the old float accumulation loop
+    total = 0.0
+    for stock in stocks:
+        total += (prices[stock['symbol']] - stock['purchase price']) * stock['shares']
+    return total
+
+
+def main(size):
+    # what the service receives from GET /stocks
+    stocks = [serialize_stock(stock) for stock in make_portfolio(size)]
+    rng = random.Random(7)
+    float_prices = {stock['symbol']: round(rng.uniform(1, 1000), 4) for stock in stocks}
+    # what PriceSnapshot holds
+    snapshot_prices = {symbol: to_price_units(price) for symbol, price in float_prices.items()}
+
+    exact = capital_gains_cents(stocks, snapshot_prices)
+    approx = float_gains(stocks, float_prices)
+
+    runs = 20
+    float_time = timeit.timeit(lambda: float_gains(stocks, float_prices), number=runs) / runs
+    cents_time = timeit.timeit(lambda: capital_gains_cents(stocks, snapshot_prices), number=runs) / runs
+    snapshot_time = timeit.timeit(
+        lambda: {symbol: to_price_units(price) for symbol, price in float_prices.items()}, number=runs) / runs
+
+    print(f"holdings:       {size}")
+    print(f"float total:    {approx!r}")
+    print(f"cents total:    {exact / 100!r}")
+    print(f"float drift:    {abs(Decimal(approx) - Decimal(exact) / 100)}")
+    print(f"float path:     {float_time * 1000:.3f} ms")
+    print(f"cents path:     {cents_time * 1000:.3f} ms")
+    print(f"price snapshot: {snapshot_time * 1000:.3f} ms (once per snapshot, not per request)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
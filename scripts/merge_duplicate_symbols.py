@@ -0,0 +1,87 @@
+"""
+Find stocks that share a symbol, which the unique "symbol" index the stocks
+services now build refuses to index. Run it before rolling the services out
+on an existing database: until the duplicates are gone, create_index fails,
+/ready stays 503 and every endpoint returns 500.
+
+Without --merge the duplicates are only reported. With --merge each group
+becomes its first document, holding the total shares at the share-weighted
+average purchase price; the other documents are deleted.
+
+Usage:
+    python -m scripts.merge_duplicate_symbols stocks1 stocks2
+    MONGO_URL=mongodb://localhost:27017/ python -m scripts.merge_duplicate_symbols --merge stocks
+"""
+import os
+import sys
+
+import pymongo
+
+from portfolio_common.money import to_cents
+
+
+def find_duplicates(inv):
+    """
+    Maps symbol -> its documents, for every symbol held by more than one document.
+    """
+    groups = inv.aggregate([
+        {'$group': {'_id': '$symbol', 'ids': {'$push': '$_id'}, 'count': {'$sum': 1}}},
+        {'$match': {'count': {'$gt': 1}}},
+    ])
+    return {group['_id']: list(inv.find({'_id': {'$in': group['ids']}}).sort('_id', 1)) for group in groups}
+
+
+def purchase_price_cents(stock):
+    # legacy documents may still carry only the float price
+    if 'purchase price cents' in stock:
+        return stock['purchase price cents']
+    return to_cents(stock['purchase price'])
+
+
+def merged_fields(stocks):
+    """
+    Total shares at the share-weighted average purchase price, rounded half up to cents.
+    """
+    shares = sum(stock['shares'] for stock in stocks)
+    cost, remainder = divmod(sum(purchase_price_cents(stock) * stock['shares'] for stock in stocks), shares)
+    if 2 * remainder >= shares:
+        cost += 1
+    return {'shares': shares, 'purchase price cents': cost}
+
+
+def merge(inv, duplicates):
+    for stocks in duplicates.values():
+        keep, extra = stocks[0], stocks[1:]
+        inv.update_one({'_id': keep['_id']},
+                       {'$set': merged_fields(stocks), '$unset': {'purchase price': ""}})
+        inv.delete_many({'_id': {'$in': [stock['_id'] for stock in extra]}})
+    if duplicates:
+        # cached capital gains must not outlive the merge
+        inv.database['meta'].update_one({'_id': 'inventory'}, {'$inc': {'version': 1}}, upsert=True)
+
+
+def main(args):
+    do_merge = '--merge' in args
+    db_names = [arg for arg in args if arg != '--merge']
+    if not db_names:
+        print(__doc__)
+        return 1
+
+    client = pymongo.MongoClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017/"))
+    found = False
+    for db_name in db_names:
+        inv = client[db_name]["inventory"]
+        duplicates = find_duplicates(inv)
+        for symbol, stocks in duplicates.items():
+            print(f"{db_name}: {symbol} is held by {len(stocks)} documents: {[stock['_id'] for stock in stocks]}")
+        if do_merge:
+            merge(inv, duplicates)
+            print(f"{db_name}: merged {len(duplicates)} symbols")
+        elif duplicates:
+            found = True
+    # non-zero while unmerged duplicates remain, so a rollout can gate on it
+    return 2 if found else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,49 @@
+"""
+Migrate stored stock documents from a float "purchase price" to integer
+"purchase price cents".
+
+Before rolling the services out on an existing database, also run
+scripts.merge_duplicate_symbols: the services require unique symbols.
+
+Usage:
+    python -m scripts.migrate_price_cents stocks1 stocks2
+    MONGO_URL=mongodb://localhost:27017/ python -m scripts.migrate_price_cents stocks
+"""
+import os
+import sys
+
+import pymongo
+
+from portfolio_common.money import to_cents
+
+
+def migrate(inv):
+    # only documents that still carry the legacy float field
+    legacy = inv.find({'purchase price': {'$exists': True}}, {'purchase price': 1})
+    updates = [
+        pymongo.UpdateOne(
+            {'_id': stock['_id']},
+            {'$set': {'purchase price cents': to_cents(stock['purchase price'])},
+             '$unset': {'purchase price': ""}}
+        )
+        for stock in legacy
+    ]
+    if not updates:
+        return 0
+    return inv.bulk_write(updates).modified_count
+
+
+def main(db_names):
+    if not db_names:
+        print(__doc__)
+        return 1
+
+    client = pymongo.MongoClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017/"))
+    for db_name in db_names:
+        migrated = migrate(client[db_name]["inventory"])
+        print(f"{db_name}: migrated {migrated} documents")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,82 @@
+"""
+Startup timing report for a service: the slowest imports (from
+`python -X importtime`) and, optionally, the time until /ready answers 200.
+
+Usage:
+    python -m scripts.startup_profile multi_services_app/stocks/stocks.py
+    python -m scripts.startup_profile K8_app/multi-service-app/stocks/app.py --ready-url http://localhost:8000/ready
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+
+def import_times(app_path):
+    app_dir, app_file = os.path.split(os.path.abspath(app_path))
+    module = os.path.splitext(app_file)[0]
+    env = dict(os.environ)
+    env.setdefault("MONGO_DB_NAME", "startup-profile")
+    # the services import the shared package from the repository root
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [repo_root, env.get("PYTHONPATH")]))
+
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=app_dir, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+
+    # lines look like: "import time:       self [us] |  cumulative | imported package"
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return elapsed, rows
+
+
+def time_to_ready(ready_url, timeout):
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(ready_url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - started
+        except OSError:
+            pass
+        time.sleep(0.1)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report import and time-to-ready for a service")
+    parser.add_argument("app", help="path to the service module, e.g. multi_services_app/stocks/stocks.py")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    parser.add_argument("--ready-url", help="poll this URL (right after restarting the service) until it answers 200")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds to wait for --ready-url")
+    args = parser.parse_args()
+
+    elapsed, rows = import_times(args.app)
+    print(f"interpreter start + import: {elapsed:.3f}s")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    if args.ready_url:
+        ready = time_to_ready(args.ready_url, args.timeout)
+        if ready is None:
+            print(f"not ready after {args.timeout:.0f}s")
+            return 1
+        print(f"time to ready: {ready:.3f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import importlib.util
+import uuid
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import mongomock
+import pymongo
+import pytest
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# The two deployment profiles: where their apps live and which field holds the stock id
+PROFILES = {
+    "compose": {
+        "id_field": "_id",
+        "stocks": ROOT / "multi_services_app" / "stocks" / "stocks.py",
+        "capital_gains": ROOT / "multi_services_app" / "capitalGain" / "capitalGains.py",
+        "stocks_urls": ["http://stocks1-a:8000", "http://stocks2:8000"],
+    },
+    "k8s": {
+        "id_field": "id",
+        "stocks": ROOT / "K8_app" / "multi-service-app" / "stocks" / "app.py",
+        "capital_gains": ROOT / "K8_app" / "multi-service-app" / "capital-gains" / "app.py",
+        "stocks_urls": ["http://stocks-app:8000"],
+    },
+}
+
+
+@pytest.fixture(params=sorted(PROFILES))
+def profile(request):
+    return PROFILES[request.param]
+
+
+@pytest.fixture(autouse=True)
+def fake_mongo(monkeypatch):
+    # mongomock clients share one in-memory server, so every test uses fresh database names
+    monkeypatch.setattr(pymongo, "MongoClient", mongomock.MongoClient)
+
+
+@pytest.fixture
+def db_name():
+    return f"test_{uuid.uuid4().hex}"
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = str(payload)
+
+    def json(self):
+        return self._payload
+
+
+@pytest.fixture
+def quotes():
+    """
+    Ticker prices served by the fake quote API; a missing symbol fails its quote.
+    """
+    return {}
+
+
+@pytest.fixture
+def services():
+    """
+    Flask test clients standing in for the stocks services, keyed by base URL.
+    """
+    return {}
+
+
+@pytest.fixture(autouse=True)
+def fake_http(monkeypatch, quotes, services):
+    calls = []
+
+    def get(url, headers=None, **kwargs):
+        calls.append(url)
+        parts = urlsplit(url)
+        if parts.netloc == "api.api-ninjas.com":
+            symbol = parse_qs(parts.query)["ticker"][0]
+            if symbol not in quotes:
+                return FakeResponse(404, {"error": "unknown ticker"})
+            return FakeResponse(200, {"price": quotes[symbol]})
+        client = services.get(f"{parts.scheme}://{parts.netloc}")
+        if client is None:
+            raise requests.ConnectionError(f"no service at {url}")
+        response = client.get(parts.path)
+        return FakeResponse(response.status_code, response.get_json())
+
+    monkeypatch.setattr(requests, "get", get)
+    return calls
+
+
+def load_app(path, monkeypatch, db_name=None):
+    """
+    Import an app module from its file under a unique name (the app files share names
+    and don't live in packages), with MONGO_DB_NAME set for the stocks services.
+    """
+    if db_name is not None:
+        monkeypatch.setenv("MONGO_DB_NAME", db_name)
+    spec = importlib.util.spec_from_file_location(f"{path.stem}_{uuid.uuid4().hex}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.app.testing = True
+    return module
@@ -0,0 +1,267 @@
+import uuid
+
+import pytest
+from pymongo.errors import PyMongoError
+
+from conftest import load_app
+from portfolio_common.validation import MAX_BATCH_IDS
+
+APPLE = {"name": "Apple", "symbol": "aapl", "purchase price": 150.25, "purchase date": "01-02-2024", "shares": 10}
+
+
+@pytest.fixture
+def stocks_app(profile, monkeypatch, db_name):
+    return load_app(profile["stocks"], monkeypatch, db_name)
+
+
+@pytest.fixture
+def client(stocks_app):
+    return stocks_app.app.test_client()
+
+
+def add_stock(client, **changes):
+    response = client.post("/stocks", json={**APPLE, **changes})
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()
+
+
+class TestStocksApp:
+
+    def test_crud(self, client, profile):
+        id_field = profile["id_field"]
+        stock_id = add_stock(client)[id_field]
+
+        response = client.get(f"/stocks/{stock_id}")
+        assert response.status_code == 200
+        stock = response.get_json()
+        assert stock[id_field] == stock_id
+        assert stock["symbol"] == "AAPL"
+        assert stock["purchase price"] == 150.25
+        assert stock["purchase price cents"] == 15025
+
+        update = {**stock, "name": "NA", "purchase price": 160, "purchase date": "NA", "shares": 12}
+        del update["purchase price cents"]
+        response = client.put(f"/stocks/{stock_id}", json=update)
+        assert response.status_code == 200
+        assert response.get_json() == {id_field: stock_id}
+
+        stock = client.get(f"/stocks/{stock_id}").get_json()
+        assert (stock["name"], stock["purchase price"], stock["purchase date"], stock["shares"]) == \
+            ("Apple", 160.0, "01-02-2024", 12)
+
+        assert client.delete(f"/stocks/{stock_id}").status_code == 204
+        assert client.get(f"/stocks/{stock_id}").status_code == 404
+        assert client.delete(f"/stocks/{stock_id}").status_code == 404
+
+    def test_duplicate_symbol(self, client):
+        add_stock(client)
+        response = client.post("/stocks", json={**APPLE, "symbol": "AAPL"})
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "Stock symbol already exists"}
+
+    def test_invalid_body(self, client):
+        response = client.post("/stocks", json={**APPLE, "shares": True})
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "Shares must be a positive integer"}
+
+        response = client.post("/stocks", data="{}", content_type="text/plain")
+        assert response.status_code == 415
+        assert response.get_json() == {"error": "Expected application/json media type"}
+
+    def test_symbol_change_rejected(self, client, profile):
+        id_field = profile["id_field"]
+        stock_id = add_stock(client)[id_field]
+        stock = client.get(f"/stocks/{stock_id}").get_json()
+
+        response = client.put(f"/stocks/{stock_id}", json={**stock, "symbol": "MSFT"})
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "Stock symbol cannot be changed"}
+
+        response = client.put("/stocks/missing", json=stock)
+        assert response.status_code == 404
+
+    def test_query_filters(self, client, profile):
+        add_stock(client)
+        add_stock(client, symbol="MSFT", **{"purchase price": 300.5})
+
+        response = client.get("/stocks", query_string={"purchase price": "300.50"})
+        assert [stock["symbol"] for stock in response.get_json()] == ["MSFT"]
+
+        assert len(client.get("/stocks").get_json()) == 2
+        assert client.get("/stocks", query_string={"symbol": "NOPE"}).status_code == 404
+        assert client.get("/stocks", query_string={"color": "red"}).status_code == 422
+        assert client.get("/stocks", query_string={"purchase price": "abc"}).status_code == 422
+        assert client.get("/stocks", query_string={"purchase price": "nan"}).status_code == 422
+
+    def test_server_error_is_500(self, client, stocks_app, monkeypatch):
+        def fail(*args, **kwargs):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(stocks_app.repo, "insert", fail)
+        monkeypatch.setattr(stocks_app.repo, "get", fail)
+
+        assert client.post("/stocks", json=APPLE).status_code == 500
+        assert client.get("/stocks/anything").status_code == 500
+
+    def test_ready(self, client):
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.get_json() == {"status": "ready"}
+
+    def test_inventory_version(self, client, profile):
+        assert client.get("/inventory-version").get_json() == {"version": 0}
+        stock_id = add_stock(client)[profile["id_field"]]
+        client.delete(f"/stocks/{stock_id}")
+        assert client.get("/inventory-version").get_json() == {"version": 2}
+
+    def test_stock_value(self, client, profile, quotes):
+        quotes["AAPL"] = 170.125
+        stock_id = add_stock(client, shares=3)[profile["id_field"]]
+
+        response = client.get(f"/stock-value/{stock_id}")
+        assert response.status_code == 200
+        assert response.get_json() == {"symbol": "AAPL", "ticker": 170.125, "stock value": 510.38}
+
+        del quotes["AAPL"]
+        response = client.get(f"/stock-value/{stock_id}")
+        assert response.status_code == 500
+        assert response.get_json() == {"error": "Failed to retrieve ticker price"}
+
+    def test_batch_values(self, client, profile, quotes, fake_http):
+        quotes.update({"AAPL": 200, "MSFT": 400})
+        first = add_stock(client, shares=2)[profile["id_field"]]
+        second = add_stock(client, symbol="msft", shares=1)[profile["id_field"]]
+
+        response = client.post("/stock-value/batch", json={"ids": [first, second, first, "missing"]})
+        assert response.status_code == 200
+        assert response.get_json() == {
+            first: {"symbol": "AAPL", "ticker": 200, "stock value": 400.0},
+            second: {"symbol": "MSFT", "ticker": 400, "stock value": 400.0},
+            "missing": {"error": "Not found"},
+        }
+        # one quote per distinct symbol
+        assert len([url for url in fake_http if "api-ninjas" in url]) == 2
+
+    def test_batch_rejects_bad_ids(self, client):
+        response = client.post("/stock-value/batch", json={"ids": ["x"] * (MAX_BATCH_IDS + 1)})
+        assert response.status_code == 400
+        assert response.get_json() == {"error": f"At most {MAX_BATCH_IDS} ids per request"}
+
+        assert client.post("/stock-value/batch", json={"ids": [1]}).status_code == 400
+        assert client.post("/stock-value/batch", json=["x"]).status_code == 400
+
+    def test_portfolio_value(self, client, quotes):
+        quotes.update({"AAPL": 0.1, "MSFT": 19.995})
+        add_stock(client, shares=3)
+        add_stock(client, symbol="MSFT", shares=10)
+
+        response = client.get("/portfolio-value")
+        assert response.status_code == 200
+        assert response.get_json()["portfolio value"] == 200.25
+
+        del quotes["MSFT"]
+        response = client.get("/portfolio-value")
+        assert response.status_code == 500
+        assert response.get_json() == {"error": "Failed to retrieve ticker price for MSFT"}
+
+
+@pytest.fixture
+def stocks_services(profile, monkeypatch, services):
+    """
+    One stocks service (with its own database) behind each URL the capital-gains app calls.
+    """
+    modules = []
+    for url in profile["stocks_urls"]:
+        module = load_app(profile["stocks"], monkeypatch, f"test_{uuid.uuid4().hex}")
+        services[url] = module.app.test_client()
+        modules.append(module)
+    return modules
+
+
+@pytest.fixture
+def gains_client(profile, monkeypatch, stocks_services):
+    return load_app(profile["capital_gains"], monkeypatch).app.test_client()
+
+
+def stocks_client_for(stocks_services):
+    return stocks_services[0].app.test_client()
+
+
+class TestCapitalGainsApp:
+
+    def test_capital_gains(self, gains_client, stocks_services, quotes):
+        client = stocks_client_for(stocks_services)
+        add_stock(client, **{"purchase price": 10.0, "shares": 10})
+        add_stock(client, symbol="MSFT", **{"purchase price": 50.0, "shares": 4})
+        quotes.update({"AAPL": 10.1, "MSFT": 45.125})
+
+        response = gains_client.get("/capital-gains")
+        assert response.status_code == 200
+        assert response.get_json() == {"total_capital_gain": -18.5}
+
+        response = gains_client.get("/capital-gains", query_string={"numsharesgt": 5})
+        assert response.get_json() == {"total_capital_gain": 1.0}
+
+    def test_result_follows_inventory_changes(self, gains_client, stocks_services, quotes):
+        client = stocks_client_for(stocks_services)
+        add_stock(client, **{"purchase price": 10.0, "shares": 10})
+        quotes["AAPL"] = 11
+
+        assert gains_client.get("/capital-gains").get_json() == {"total_capital_gain": 10.0}
+        # cached while nothing changed
+        assert gains_client.get("/capital-gains").get_json() == {"total_capital_gain": 10.0}
+
+        add_stock(client, symbol="MSFT", **{"purchase price": 1.0, "shares": 1})
+        quotes["MSFT"] = 3
+        assert gains_client.get("/capital-gains").get_json() == {"total_capital_gain": 12.0}
+
+    def test_failed_quote(self, gains_client, stocks_services, quotes):
+        add_stock(stocks_client_for(stocks_services))
+
+        response = gains_client.get("/capital-gains")
+        assert response.status_code == 500
+        assert response.get_json() == {"error": "Failed to retrieve ticker price for AAPL"}
+
+    def test_failed_fetch_is_not_cached(self, gains_client, stocks_services, quotes, monkeypatch):
+        add_stock(stocks_client_for(stocks_services), **{"purchase price": 10.0, "shares": 10})
+        quotes["AAPL"] = 11
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("boom")
+
+        # /stocks fails while /inventory-version still answers
+        with monkeypatch.context() as patch:
+            patch.setattr(stocks_services[0].repo, "find", fail)
+            response = gains_client.get("/capital-gains")
+            assert response.status_code == 500
+            assert response.get_json() == {"error": "Failed to retrieve stocks"}
+
+        assert gains_client.get("/capital-gains").get_json() == {"total_capital_gain": 10.0}
+
+    def test_without_price_snapshot(self, profile, monkeypatch, stocks_services, quotes):
+        monkeypatch.setenv("PRICE_SNAPSHOT_SECONDS", "0")
+        gains_client = load_app(profile["capital_gains"], monkeypatch).app.test_client()
+        add_stock(stocks_client_for(stocks_services), **{"purchase price": 10.0, "shares": 10})
+
+        quotes["AAPL"] = 11
+        assert gains_client.get("/capital-gains").get_json() == {"total_capital_gain": 10.0}
+        # nothing is cached, so a new quote shows up right away
+        quotes["AAPL"] = 12
+        assert gains_client.get("/capital-gains").get_json() == {"total_capital_gain": 20.0}
+
+    def test_failed_version_bump_stops_caching(self, gains_client, stocks_services, quotes, monkeypatch):
+        client = stocks_client_for(stocks_services)
+        add_stock(client, **{"purchase price": 10.0, "shares": 10})
+        quotes.update({"AAPL": 11, "MSFT": 3})
+        assert gains_client.get("/capital-gains").get_json() == {"total_capital_gain": 10.0}
+
+        def fail():
+            raise PyMongoError("meta unavailable")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(stocks_services[0].repo, "_bump", fail)
+            add_stock(client, symbol="MSFT", **{"purchase price": 1.0, "shares": 1})
+            assert client.get("/inventory-version").status_code == 500
+            assert gains_client.get("/capital-gains").get_json() == {"total_capital_gain": 12.0}
+
+        assert gains_client.get("/capital-gains").get_json() == {"total_capital_gain": 12.0}
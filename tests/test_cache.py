@@ -0,0 +1,33 @@
+from portfolio_common.cache import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
+
+
+def test_get_refreshes_recency():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+
+def test_put_replaces_existing_key():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("a", 2)
+
+    assert len(cache) == 1
+    assert cache.get("a") == 2
@@ -0,0 +1,27 @@
+import mongomock
+
+from scripts.merge_duplicate_symbols import find_duplicates, merge
+
+
+def test_merge_duplicate_symbols(db_name):
+    db = mongomock.MongoClient()[db_name]
+    inv = db["inventory"]
+    inv.insert_many([
+        {"_id": "1", "symbol": "ABC", "shares": 1, "purchase price cents": 1000},
+        {"_id": "2", "symbol": "ABC", "shares": 2, "purchase price": 20.005},
+        {"_id": "3", "symbol": "XYZ", "shares": 5, "purchase price cents": 500},
+    ])
+
+    duplicates = find_duplicates(inv)
+    assert {symbol: [stock["_id"] for stock in stocks] for symbol, stocks in duplicates.items()} == {"ABC": ["1", "2"]}
+
+    merge(inv, duplicates)
+
+    # (1 * 1000 + 2 * 2001) / 3 = 1667.33 -> 1667
+    assert list(inv.find({"symbol": "ABC"})) == [
+        {"_id": "1", "symbol": "ABC", "shares": 3, "purchase price cents": 1667},
+    ]
+    assert inv.count_documents({}) == 2
+    assert find_duplicates(inv) == {}
+    assert db["meta"].find_one({"_id": "inventory"})["version"] == 1
+    inv.create_index([("symbol", 1)], unique=True)
@@ -0,0 +1,63 @@
+from decimal import Decimal
+
+import pytest
+
+from portfolio_common.money import (
+    UNITS_PER_CENT, from_cents, is_positive_amount, to_cents, to_price_units, units_to_cents,
+)
+
+
+@pytest.mark.parametrize("amount, cents", [
+    (0.1, 10),
+    (19.99, 1999),
+    (0.125, 13),     # half up, not banker's rounding
+    (1.005, 101),    # the float's repr, not its binary value, is rounded
+    (100, 10000),
+    (Decimal("2.675"), 268),
+    (-0.125, -13),
+])
+def test_to_cents(amount, cents):
+    assert to_cents(amount) == cents
+
+
+@pytest.mark.parametrize("amount", [float("nan"), float("inf"), "nan"])
+def test_to_cents_rejects_non_finite(amount):
+    with pytest.raises(ValueError):
+        to_cents(amount)
+
+
+def test_to_cents_rejects_non_numbers():
+    with pytest.raises(ArithmeticError):
+        to_cents("abc")
+
+
+def test_from_cents_round_trips():
+    for amount in (0.01, 0.1, 19.99, 123.45):
+        assert from_cents(to_cents(amount)) == amount
+
+
+def test_to_price_units():
+    assert to_price_units(123.456789) == 123456789
+    assert to_price_units(0.1) == 100000
+
+
+def test_units_to_cents_rounds_half_away_from_zero():
+    assert units_to_cents(UNITS_PER_CENT // 2) == 1
+    assert units_to_cents(UNITS_PER_CENT // 2 - 1) == 0
+    assert units_to_cents(-UNITS_PER_CENT // 2) == -1
+    assert units_to_cents(-(UNITS_PER_CENT // 2 - 1)) == 0
+
+
+@pytest.mark.parametrize("value, expected", [
+    (1, True),
+    (0.01, True),
+    (0, False),
+    (-5, False),
+    (True, False),
+    (float("nan"), False),
+    (float("inf"), False),
+    ("10", False),
+    (None, False),
+])
+def test_is_positive_amount(value, expected):
+    assert is_positive_amount(value) is expected
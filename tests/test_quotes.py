@@ -0,0 +1,51 @@
+import pytest
+
+from portfolio_common.quotes import PriceSnapshot
+
+
+def test_prices_are_shared_within_a_snapshot(quotes, fake_http):
+    snapshot = PriceSnapshot(60)
+    quotes["ABC"] = 1.5
+
+    assert snapshot.get_units("ABC", 1) == 1500000
+    quotes["ABC"] = 2
+    assert snapshot.get_units("ABC", 1) == 1500000
+    assert len(fake_http) == 1
+
+    assert snapshot.get_units("ABC", 2) == 2000000
+
+
+def test_failed_quotes_are_not_cached(quotes):
+    snapshot = PriceSnapshot(60)
+
+    assert snapshot.get_units("ABC", 1) is None
+    quotes["ABC"] = 3
+    assert snapshot.get_units("ABC", 1) == 3000000
+
+
+def test_older_snapshot_does_not_reset_newer_prices(quotes, fake_http):
+    snapshot = PriceSnapshot(60)
+    quotes["ABC"] = 1
+    snapshot.get_units("ABC", 2)
+
+    # a request still on snapshot 1 gets a fresh quote that isn't stored
+    quotes["ABC"] = 5
+    assert snapshot.get_units("ABC", 1) == 5000000
+    assert snapshot.get_units("ABC", 2) == 1000000
+    assert len(fake_http) == 2
+
+
+def test_zero_seconds_disables_the_snapshot(quotes, fake_http):
+    snapshot = PriceSnapshot(0)
+    quotes["ABC"] = 1
+
+    assert snapshot.current_id() is None
+    assert snapshot.get_units("ABC", None) == 1000000
+    quotes["ABC"] = 2
+    assert snapshot.get_units("ABC", None) == 2000000
+    assert len(fake_http) == 2
+
+
+def test_negative_seconds_rejected():
+    with pytest.raises(ValueError):
+        PriceSnapshot(-1)
@@ -0,0 +1,133 @@
+import pytest
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from portfolio_common.repository import InventoryRepository
+
+
+@pytest.fixture(params=["_id", "id"])
+def repo(request, db_name):
+    return InventoryRepository(db_name, id_field=request.param, url="mongodb://localhost:27017/")
+
+
+def new_stock(symbol, shares=10, price_cents=1000):
+    return {
+        "name": "NA",
+        "symbol": symbol,
+        "purchase price cents": price_cents,
+        "purchase date": "NA",
+        "shares": shares,
+    }
+
+
+def test_insert_and_get(repo):
+    stock_id = repo.insert(new_stock("ABC", price_cents=1999))
+
+    stock = repo.get(stock_id)
+    assert stock[repo.id_field] == stock_id
+    assert stock["purchase price cents"] == 1999
+    assert stock["purchase price"] == 19.99
+    if repo.id_field != "_id":
+        assert "_id" not in stock
+    assert repo.get("missing") is None
+
+
+def test_duplicate_symbol_raises(repo):
+    repo.insert(new_stock("ABC"))
+    with pytest.raises(DuplicateKeyError):
+        repo.insert(new_stock("ABC"))
+    assert len(repo.find()) == 1
+
+
+def test_find_filters_on_purchase_price(repo):
+    repo.insert(new_stock("ABC", price_cents=1999))
+    repo.insert(new_stock("XYZ", price_cents=500))
+
+    assert [stock["symbol"] for stock in repo.find({"purchase price": "19.99"})] == ["ABC"]
+    assert [stock["symbol"] for stock in repo.find({"symbol": "XYZ"})] == ["XYZ"]
+    with pytest.raises(ValueError):
+        repo.find({"purchase price": "nan"})
+
+
+def test_find_by_ids(repo):
+    first = repo.insert(new_stock("ABC"))
+    second = repo.insert(new_stock("XYZ"))
+    repo.insert(new_stock("DEF"))
+
+    stocks = repo.find_by_ids([first, second, "missing"])
+
+    assert set(stocks) == {first, second}
+    assert stocks[first]["symbol"] == "ABC"
+    assert stocks[second]["symbol"] == "XYZ"
+
+
+def test_update_and_delete(repo):
+    stock_id = repo.insert(new_stock("ABC"))
+
+    assert repo.update(stock_id, {"shares": 20})
+    assert repo.get(stock_id)["shares"] == 20
+    assert not repo.update("missing", {"shares": 20})
+
+    assert repo.delete(stock_id)
+    assert repo.get(stock_id) is None
+    assert not repo.delete(stock_id)
+
+
+def test_update_drops_legacy_price(repo):
+    repo.collection().insert_one({repo.id_field: "legacy", "symbol": "OLD", "shares": 1, "purchase price": 12.5})
+    assert repo.get("legacy")["purchase price cents"] == 1250
+
+    repo.update("legacy", {"purchase price cents": 1300})
+
+    stored = repo.collection().find_one({repo.id_field: "legacy"})
+    assert "purchase price" not in stored
+    assert stored["purchase price cents"] == 1300
+
+
+def test_version_changes_on_every_write(repo):
+    assert repo.version() == 0
+    stock_id = repo.insert(new_stock("ABC"))
+    assert repo.version() == 1
+    repo.update(stock_id, {"shares": 5})
+    assert repo.version() == 2
+    repo.delete(stock_id)
+    assert repo.version() == 3
+
+    # writes that change nothing leave the version alone
+    repo.update("missing", {"shares": 5})
+    repo.delete("missing")
+    assert repo.version() == 3
+
+    repo.bump_version()
+    assert repo.version() == 4
+
+
+def test_failed_version_bump_does_not_fail_the_write(repo, monkeypatch, capsys):
+    meta = repo.collection().database["meta"]
+
+    def fail(*args, **kwargs):
+        raise PyMongoError("meta unavailable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(type(meta), "update_one", fail)
+        stock_id = repo.insert(new_stock("ABC"))
+
+        assert repo.get(stock_id) is not None
+        assert "Failed to bump the inventory version" in capsys.readouterr().out
+        # the version doesn't cover the write, so it is unavailable rather than stale
+        with pytest.raises(PyMongoError):
+            repo.version()
+
+    # the pending bump is retried on the next read
+    assert repo.version() == 1
+    assert repo.version() == 1
+
+
+def test_holdings(repo):
+    repo.insert(new_stock("ABC", shares=3))
+    assert [(stock["symbol"], stock["shares"]) for stock in repo.holdings()] == [("ABC", 3)]
+
+
+def test_is_ready(repo):
+    assert repo.is_ready()
+    repo.collection()
+    assert repo.is_ready()
@@ -0,0 +1,114 @@
+import pytest
+
+from portfolio_common.validation import (
+    MAX_BATCH_IDS, validate_batch_ids, validate_date_format, validate_new_stock, validate_update,
+)
+
+
+@pytest.mark.parametrize("date_string, expected", [
+    ("01-02-2024", True),
+    ("29-02-2024", True),
+    ("30-02-2024", False),
+    ("2024-02-01", False),
+    ("1-2-2024", False),
+    (None, False),
+])
+def test_validate_date_format(date_string, expected):
+    assert validate_date_format(date_string) is expected
+
+
+def test_validate_new_stock():
+    fields, error = validate_new_stock({"symbol": "abc", "purchase price": 19.99, "shares": 3})
+
+    assert error is None
+    assert fields == {
+        "name": "NA",
+        "symbol": "ABC",
+        "purchase price cents": 1999,
+        "purchase date": "NA",
+        "shares": 3,
+    }
+
+
+@pytest.mark.parametrize("data, message", [
+    ([], "Malformed data"),
+    ({"symbol": "ABC", "shares": 3}, "Malformed data"),
+    ({"symbol": 1, "purchase price": 1, "shares": 3}, "Invalid stock symbol"),
+    ({"symbol": "ABC", "purchase price": 1, "shares": True}, "Shares must be a positive integer"),
+    ({"symbol": "ABC", "purchase price": 1, "shares": 0}, "Shares must be a positive integer"),
+    ({"symbol": "ABC", "purchase price": True, "shares": 3}, "Purchase price must be a positive number"),
+    ({"symbol": "ABC", "purchase price": "1", "shares": 3}, "Purchase price must be a positive number"),
+    ({"symbol": "ABC", "purchase price": 1, "shares": 3, "name": 5}, "name must be a string"),
+    ({"symbol": "ABC", "purchase price": 1, "shares": 3, "purchase date": "2024-01-01"},
+     "Invalid date format. Use DD-MM-YYYY"),
+])
+def test_validate_new_stock_errors(data, message):
+    assert validate_new_stock(data) == (None, message)
+
+
+def test_validate_batch_ids():
+    assert validate_batch_ids({"ids": ["a", "b"]}) == (["a", "b"], None)
+    assert validate_batch_ids({"ids": []}) == ([], None)
+    assert validate_batch_ids({"ids": ["a"] * MAX_BATCH_IDS}) == (["a"] * MAX_BATCH_IDS, None)
+
+
+@pytest.mark.parametrize("data, message", [
+    (["a"], "Malformed data"),
+    ({}, "Malformed data"),
+    ({"ids": "a"}, "Malformed data"),
+    ({"ids": ["a", 1]}, "Malformed data"),
+    ({"ids": ["a"] * (MAX_BATCH_IDS + 1)}, f"At most {MAX_BATCH_IDS} ids per request"),
+])
+def test_validate_batch_ids_errors(data, message):
+    assert validate_batch_ids(data) == (None, message)
+
+
+@pytest.mark.parametrize("id_field", ["_id", "id"])
+class TestValidateUpdate:
+
+    def stored(self, id_field):
+        return {id_field: "1", "name": "Apple", "symbol": "ABC", "purchase date": "01-01-2024"}
+
+    def body(self, id_field, **changes):
+        data = {id_field: "1", "name": "NA", "symbol": "ABC", "purchase price": 2.5,
+                "purchase date": "NA", "shares": 4}
+        data.update(changes)
+        return data
+
+    def test_na_keeps_stored_values(self, id_field):
+        fields, error = validate_update(self.body(id_field), self.stored(id_field), id_field)
+
+        assert error is None
+        assert fields == {
+            "name": "Apple",
+            "purchase price cents": 250,
+            "purchase date": "01-01-2024",
+            "shares": 4,
+        }
+
+    def test_replaces_values(self, id_field):
+        body = self.body(id_field, name="Apple Inc", **{"purchase date": "02-01-2024"})
+        fields, error = validate_update(body, self.stored(id_field), id_field)
+
+        assert error is None
+        assert fields["name"] == "Apple Inc"
+        assert fields["purchase date"] == "02-01-2024"
+
+    @pytest.mark.parametrize("changes, message", [
+        ({"symbol": "XYZ"}, "Stock symbol cannot be changed"),
+        ({"shares": -1}, "Shares must be a positive integer"),
+        ({"purchase price": 0}, "Purchase price must be a positive number"),
+        ({"purchase date": "bad"}, "Invalid date format. Use DD-MM-YYYY"),
+    ])
+    def test_errors(self, id_field, changes, message):
+        body = self.body(id_field, **changes)
+        assert validate_update(body, self.stored(id_field), id_field) == (None, message)
+
+    def test_id_cannot_change(self, id_field):
+        body = self.body(id_field, **{id_field: "2"})
+        assert validate_update(body, self.stored(id_field), id_field) == (None, "Stock ID cannot be changed")
+
+    def test_id_field_is_required(self, id_field):
+        body = self.body(id_field)
+        del body[id_field]
+        assert validate_update(body, self.stored(id_field), id_field) == (None, "Malformed data")
@@ -0,0 +1,67 @@
+from portfolio_common.money import to_price_units
+from portfolio_common.valuation import (
+    batch_values, capital_gains_cents, filter_by_shares, portfolio_value, portfolio_value_cents, stock_value,
+)
+
+
+def test_stock_value_multiplies_before_rounding():
+    # 0.125 * 3 = 0.375 -> 0.38; rounding the quote first would give 0.39
+    value = stock_value({"symbol": "ABC", "shares": 3}, 0.125)
+    assert value == {"symbol": "ABC", "ticker": 0.125, "stock value": 0.38}
+
+
+def test_batch_values_reports_errors_per_id():
+    stocks = {"1": {"symbol": "ABC", "shares": 2}, "2": {"symbol": "XYZ", "shares": 1}}
+    prices = {"ABC": 10.5, "XYZ": None}
+
+    values = batch_values(["1", "2", "3"], stocks, prices)
+
+    assert values["1"] == {"symbol": "ABC", "ticker": 10.5, "stock value": 21.0}
+    assert values["2"] == {"error": "Failed to retrieve ticker price"}
+    assert values["3"] == {"error": "Not found"}
+
+
+def test_portfolio_value_cents():
+    stocks = [{"symbol": "ABC", "shares": 3}, {"symbol": "XYZ", "shares": 10}]
+    prices = {"ABC": to_price_units(0.1), "XYZ": to_price_units(19.995)}
+
+    # 0.30 + 199.95, exact where float sums would drift
+    assert portfolio_value_cents(stocks, prices) == 20025
+
+
+def test_portfolio_value_quotes_each_symbol_once(quotes, fake_http):
+    quotes.update({"ABC": 0.1, "XYZ": 19.995})
+    holdings = [{"symbol": "ABC", "shares": 3}, {"symbol": "XYZ", "shares": 4}, {"symbol": "XYZ", "shares": 6}]
+
+    assert portfolio_value(holdings) == (20025, None)
+    assert len(fake_http) == 2
+
+
+def test_portfolio_value_failed_quote(quotes):
+    quotes["ABC"] = 1
+    holdings = [{"symbol": "ABC", "shares": 3}, {"symbol": "XYZ", "shares": 1}]
+
+    assert portfolio_value(holdings) == (None, "Failed to retrieve ticker price for XYZ")
+
+
+def test_capital_gains_cents_uses_stored_cents():
+    stocks = [
+        {"symbol": "ABC", "shares": 10, "purchase price": 1.0, "purchase price cents": 100},
+        {"symbol": "XYZ", "shares": 4, "purchase price": 50.0, "purchase price cents": 5000},
+    ]
+    prices = {"ABC": to_price_units(1.1), "XYZ": to_price_units(45.125)}
+
+    # 10 * 0.10 + 4 * -4.875 = -18.50
+    assert capital_gains_cents(stocks, prices) == -1850
+
+
+def test_capital_gains_cents_empty():
+    assert capital_gains_cents([], {}) == 0
+
+
+def test_filter_by_shares():
+    stocks = [{"shares": 1}, {"shares": 5}, {"shares": 10}]
+    assert filter_by_shares(stocks) == stocks
+    assert filter_by_shares(stocks, numsharesgt=1) == [{"shares": 5}, {"shares": 10}]
+    assert filter_by_shares(stocks, numshareslt=10) == [{"shares": 1}, {"shares": 5}]
+    assert filter_by_shares(stocks, numsharesgt=1, numshareslt=10) == [{"shares": 5}]